@@ -1,4 +1,5 @@
 from django.contrib import admin
+from django.utils import timezone
 from django.utils.html import format_html
 from .models import Product, ContactMessage
 
@@ -61,9 +62,7 @@ class ProductAdmin(admin.ModelAdmin):
     
     def dress_type_display(self, obj):
         """Display dress type or dash if not applicable."""
-        if obj.dress_type:
-            return obj.get_dress_type_display()
-        return "-"
+        return obj.get_dress_type_display_safe() or "-"
     dress_type_display.short_description = 'Dress Type'
     dress_type_display.admin_order_field = 'dress_type'
     
@@ -99,12 +98,12 @@ class ProductAdmin(admin.ModelAdmin):
     
     @admin.action(description='✅ Mark selected products as available')
     def make_available(self, request, queryset):
-        updated = queryset.update(is_available=True)
+        updated = queryset.update(is_available=True, updated_at=timezone.now())
         self.message_user(request, f'{updated} product(s) marked as available.')
     
     @admin.action(description='❌ Mark selected products as unavailable')
     def make_unavailable(self, request, queryset):
-        updated = queryset.update(is_available=False)
+        updated = queryset.update(is_available=False, updated_at=timezone.now())
         self.message_user(request, f'{updated} product(s) marked as unavailable.')
 
 
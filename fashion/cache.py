@@ -0,0 +1,15 @@
+from django.db.models import Count, Max
+
+from .models import Product
+
+
+def products_version():
+    """Return a stamp that changes with every product write.
+
+    Read from the database rather than a cache key, so every web and worker
+    process agrees even when each has its own local-memory cache. The count
+    catches deletes; the latest updated_at catches adds and edits.
+    """
+    stats = Product.objects.aggregate(count=Count('id'), latest=Max('updated_at'))
+    latest = stats['latest'].timestamp() if stats['latest'] else 0
+    return f"{stats['count']}-{latest}"
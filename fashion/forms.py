@@ -0,0 +1,71 @@
+from django import forms
+from .models import Product
+from .uploads import MAX_IMAGE_SIZE, public_id_from_url
+
+
+class DressForm(forms.ModelForm):
+    """Validates the dashboard upload/edit dress forms."""
+    image = forms.ImageField(
+        required=False,
+        error_messages={
+            'required': 'Please upload an image.',
+            'invalid_image': 'Please upload a valid image file.',
+        },
+    )
+
+    # Filled in by the browser after a direct upload to Cloudinary
+    image_url = forms.URLField(required=False, max_length=500)
+
+    class Meta:
+        model = Product
+        fields = ['name', 'dress_type', 'description', 'price', 'is_available']
+        error_messages = {
+            'name': {'required': 'Dress name is required.'},
+            'dress_type': {
+                'required': 'Please select a dress type.',
+                'invalid_choice': 'Please select a dress type.',
+            },
+            'description': {'required': 'Description is required.'},
+            'price': {
+                'required': 'Price is required.',
+                'invalid': 'Invalid price format.',
+            },
+        }
+
+    def __init__(self, *args, require_image=False, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Optional on the model (other categories), but every dress needs one
+        self.fields['dress_type'].required = True
+        self.require_image = require_image
+
+    def clean_image(self):
+        image = self.cleaned_data['image']
+        if image and image.size > MAX_IMAGE_SIZE:
+            raise forms.ValidationError(f'Images must be {MAX_IMAGE_SIZE // (1024 * 1024)}MB or smaller.')
+        return image
+
+    def clean_image_url(self):
+        image_url = self.cleaned_data['image_url']
+        # Derived from the URL, never taken from the browser, since it is later passed to destroy()
+        public_id = public_id_from_url(image_url) if image_url else ''
+        if public_id is None:
+            raise forms.ValidationError('Invalid image URL.')
+        self.cleaned_data['image_public_id'] = public_id
+        return image_url
+
+    def clean(self):
+        cleaned_data = super().clean()
+        has_image = cleaned_data.get('image') or cleaned_data.get('image_url')
+        if self.require_image and not has_image and 'image' not in self.errors:
+            self.add_error('image', self.fields['image'].error_messages['required'])
+        return cleaned_data
+
+    def clean_price(self):
+        price = self.cleaned_data['price']
+        if price < 0:
+            raise forms.ValidationError('Price must be a positive number.')
+        return price
+
+    def error_list(self):
+        """Flatten errors into the list the dashboard templates render."""
+        return [error for errors in self.errors.values() for error in errors]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-15 15:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fashion', '0005_product_image_url_alter_product_image'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='product',
+            options={'ordering': ['-created_at']},
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['category', 'is_available', '-created_at'], name='prod_cat_avail_created'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['is_available', '-created_at'], name='prod_avail_created'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+from django.db import migrations
+
+# Matches the SQL Django emits for name__icontains on PostgreSQL:
+# UPPER("name"::text) LIKE UPPER('%...%')
+CREATE_INDEX_SQL = (
+    'CREATE INDEX IF NOT EXISTS prod_name_trgm ON fashion_product '
+    'USING gin ((UPPER("name"::text)) gin_trgm_ops)'
+)
+DROP_INDEX_SQL = 'DROP INDEX IF EXISTS prod_name_trgm'
+
+
+def create_trgm_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        schema_editor.execute(CREATE_INDEX_SQL)
+
+
+def drop_trgm_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(DROP_INDEX_SQL)
+
+
+class Migration(migrations.Migration):
+    """Trigram index for dashboard/admin name search (PostgreSQL only)."""
+
+    dependencies = [
+        ('fashion', '0007_product_image_processing'),
+    ]
+
+    operations = [
+        # No-op on non-PostgreSQL databases (e.g. local SQLite)
+        migrations.RunPython(create_trgm_index, drop_trgm_index),
+    ]
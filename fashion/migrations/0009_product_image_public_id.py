@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-15 15:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fashion', '0008_product_name_trgm_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='image_public_id',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+    ]
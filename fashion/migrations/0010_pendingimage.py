@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-15 15:23
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fashion', '0009_product_image_public_id'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PendingImage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255)),
+                ('data', models.BinaryField()),
+                ('make_available', models.BooleanField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('product', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='pending_image', to='fashion.product')),
+            ],
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-15 15:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fashion', '0010_pendingimage'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='image_upload_failed',
+            field=models.BooleanField(default=False),
+        ),
+    ]
@@ -1,6 +1,30 @@
-from django.db import models
+from datetime import timedelta
+from uuid import uuid4
+
+from django.db import IntegrityError, models, transaction
+from django.utils import timezone
 from django.utils.text import slugify
 
+
+# Leaves room in the 50-character slug column for a "-N" or random suffix
+SLUG_BASE_MAX_LENGTH = 40
+
+
+def slug_base(name):
+    """Slugify name, truncated so any collision suffix still fits."""
+    return slugify(name)[:SLUG_BASE_MAX_LENGTH].rstrip('-')
+
+
+def next_free_slug(base_slug, taken):
+    """Return base_slug, or base_slug-N with the lowest N not in taken."""
+    slug = base_slug
+    counter = 1
+    while slug in taken:
+        slug = f"{base_slug}-{counter}"
+        counter += 1
+    return slug
+
+
 class Product(models.Model):
     # Main category choices
     CATEGORY_CHOICES = [
@@ -38,6 +62,10 @@ class Product(models.Model):
         ('custom', 'Custom Design'),
     ]
 
+    # Precomputed label lookups (Django's get_FOO_display rebuilds a dict per call)
+    CATEGORY_MAP = dict(CATEGORY_CHOICES)
+    DRESS_TYPE_MAP = dict(DRESS_TYPE_CHOICES)
+
     name = models.CharField(max_length=150)
     slug = models.SlugField(unique=True, blank=True)
     category = models.CharField(max_length=50, choices=CATEGORY_CHOICES, default='dresses')
@@ -46,8 +74,21 @@ class Product(models.Model):
     price = models.DecimalField(max_digits=8, decimal_places=2)
     image = models.ImageField(upload_to="products/", blank=True, null=True)  # Keep original field
     image_url = models.URLField(max_length=500, blank=True, null=True)  # Cloudinary URL
+    image_public_id = models.CharField(max_length=255, blank=True, default='')  # For Cloudinary deletes
+    image_processing = models.BooleanField(default=False)  # Cloudinary upload still queued
+    image_upload_failed = models.BooleanField(default=False)  # Pending image kept for a retry
     is_available = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)  # Drives the product API ETag
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            # Dashboard and related-products queries: category + status, newest first
+            models.Index(fields=['category', 'is_available', '-created_at'], name='prod_cat_avail_created'),
+            # Home grid and API: available products, newest first
+            models.Index(fields=['is_available', '-created_at'], name='prod_avail_created'),
+        ]
     
     def get_image_display_url(self):
         """Return Cloudinary URL if available, otherwise local image URL."""
@@ -58,25 +99,71 @@ class Product(models.Model):
         return ''
 
     def save(self, *args, **kwargs):
-        if not self.slug:
-            base_slug = slugify(self.name)
-            slug = base_slug
-            counter = 1
-            while Product.objects.filter(slug=slug).exclude(pk=self.pk).exists():
-                slug = f"{base_slug}-{counter}"
-                counter += 1
-            self.slug = slug
-        super().save(*args, **kwargs)
+        if self.slug:
+            return super().save(*args, **kwargs)
+
+        # Fetch every colliding slug in one query, then pick a suffix in Python
+        base_slug = slug_base(self.name)
+        taken = set(
+            Product.objects.filter(slug__startswith=base_slug)
+            .exclude(pk=self.pk)
+            .values_list('slug', flat=True)
+        )
+        self.slug = next_free_slug(base_slug, taken)
+        try:
+            with transaction.atomic():
+                super().save(*args, **kwargs)
+        except IntegrityError:
+            # Another request grabbed the same slug in the meantime
+            self.slug = f"{base_slug}-{uuid4().hex[:6]}"
+            super().save(*args, **kwargs)
 
     def __str__(self):
         return self.name
     
+    def get_category_display(self):
+        return self.CATEGORY_MAP.get(self.category, self.category)
+    
     def get_dress_type_display_safe(self):
         """Return dress type display or empty string if not applicable."""
         if self.dress_type:
-            return self.get_dress_type_display()
+            return self.DRESS_TYPE_MAP.get(self.dress_type, self.dress_type)
         return ""
 
+
+# Failed uploads keep their image this long for a retry before it is discarded
+PENDING_IMAGE_MAX_AGE = timedelta(days=7)
+
+
+class PendingImage(models.Model):
+    """Image bytes waiting for the background uploader.
+
+    Kept in the database rather than on local disk so the web and worker
+    processes don't need shared storage.
+    """
+    product = models.OneToOneField(Product, on_delete=models.CASCADE, related_name='pending_image')
+    name = models.CharField(max_length=255)
+    data = models.BinaryField()
+    # Availability to apply once the image is live (None leaves it unchanged)
+    make_available = models.BooleanField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.name
+
+
+def discard_stale_pending_images():
+    """Delete images of uploads that failed over PENDING_IMAGE_MAX_AGE ago.
+
+    Failures stamp the product's updated_at, so editing or retrying a dress
+    restarts its clock. The dashboard asks for a fresh upload afterwards.
+    """
+    cutoff = timezone.now() - PENDING_IMAGE_MAX_AGE
+    PendingImage.objects.filter(
+        product__image_upload_failed=True, product__updated_at__lt=cutoff,
+    ).delete()
+
+
 class ContactMessage(models.Model):
     name = models.CharField(max_length=100)
     email = models.EmailField()
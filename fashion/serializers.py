@@ -6,6 +6,21 @@ class ProductSerializer(serializers.ModelSerializer):
         model = Product
         fields = "__all__"
 
+class ProductListSerializer(serializers.Serializer):
+    """Read-only, explicit-field serializer for the public product list."""
+    id = serializers.IntegerField()
+    name = serializers.CharField()
+    slug = serializers.CharField()
+    category = serializers.CharField()
+    dress_type = serializers.CharField()
+    price = serializers.DecimalField(max_digits=8, decimal_places=2)
+    image_url = serializers.CharField(source='get_image_display_url')
+
+class ProductStatusSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Product
+        fields = ['id', 'image_url', 'image_processing', 'image_upload_failed', 'is_available']
+
 class ContactMessageSerializer(serializers.ModelSerializer):
     class Meta:
         model = ContactMessage
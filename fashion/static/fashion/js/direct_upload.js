@@ -0,0 +1,41 @@
+// Uploads the chosen dress image straight to Cloudinary before the form is
+// submitted, so the file never passes through the Django worker. Forms opt in
+// with data-direct-upload="<signature endpoint>". If anything fails, the form
+// is submitted with the file as usual and the server uploads it instead.
+document.addEventListener('DOMContentLoaded', () => {
+    document.querySelectorAll('form[data-direct-upload]').forEach((form) => {
+        const fileInput = form.querySelector('input[type="file"][name="image"]');
+        
+        form.addEventListener('submit', async (e) => {
+            if (!fileInput || !fileInput.files.length || !form.checkValidity()) return;
+            e.preventDefault();
+            
+            const submitBtn = form.querySelector('[type="submit"]');
+            if (submitBtn) submitBtn.disabled = true;
+            
+            try {
+                const signResponse = await fetch(form.dataset.directUpload);
+                if (!signResponse.ok) throw new Error('Could not sign upload');
+                const signed = await signResponse.json();
+                
+                const body = new FormData();
+                body.append('file', fileInput.files[0]);
+                ['api_key', 'timestamp', 'signature', 'folder'].forEach((key) => body.append(key, signed[key]));
+                
+                const uploadResponse = await fetch(signed.upload_url, { method: 'POST', body });
+                if (!uploadResponse.ok) throw new Error('Cloudinary upload failed');
+                const uploaded = await uploadResponse.json();
+                
+                form.querySelector('input[name="image_url"]').value = uploaded.secure_url;
+                // Don't send the bytes to Django as well
+                fileInput.required = false;
+                fileInput.value = '';
+            } catch (err) {
+                console.warn('Direct upload failed, sending image through the server:', err);
+            }
+            
+            // form.submit() skips this handler, so there is no loop
+            form.submit();
+        });
+    });
+});
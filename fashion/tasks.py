@@ -0,0 +1,54 @@
+from celery import shared_task
+from django.core.files.base import ContentFile
+from django.utils import timezone
+
+from .models import PendingImage, Product, discard_stale_pending_images
+from .uploads import cloudinary_upload, delete_from_cloudinary
+
+
+@shared_task
+def upload_product_image(product_id):
+    """Send a product's pending image to Cloudinary and attach the URL to it.
+
+    The pending ``make_available`` is applied only once the image is live, so
+    new dresses stay hidden until they have something to show.
+    """
+    discard_stale_pending_images()
+    pending = PendingImage.objects.filter(product_id=product_id).first()
+    if pending is None:
+        return
+    result = None
+    try:
+        result = cloudinary_upload(ContentFile(pending.data, name=pending.name))
+    finally:
+        if not result:
+            # Keep the pending image so the upload can be retried from the dashboard
+            Product.objects.filter(pk=product_id).update(
+                image_processing=False, image_upload_failed=True, updated_at=timezone.now(),
+            )
+    if not result:
+        return
+
+    old_public_id = (
+        Product.objects.filter(pk=product_id)
+        .values_list('image_public_id', flat=True).first()
+    )
+    updates = {
+        'image_processing': False,
+        'image_upload_failed': False,
+        'image_url': result.get('secure_url'),
+        'image_public_id': result.get('public_id', ''),
+        'updated_at': timezone.now(),
+    }
+    if pending.make_available is not None:
+        updates['is_available'] = pending.make_available
+    Product.objects.filter(pk=product_id).update(**updates)
+    pending.delete()
+    if old_public_id:
+        delete_from_cloudinary(old_public_id)
+
+
+@shared_task
+def delete_product_image(public_id):
+    """Remove a replaced or deleted product image from Cloudinary."""
+    delete_from_cloudinary(public_id)
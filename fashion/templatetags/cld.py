@@ -0,0 +1,42 @@
+from functools import lru_cache
+from django import template
+
+register = template.Library()
+
+# Scale down (never up), pick the best format (WebP/AVIF) and quality per browser
+DEFAULT_SPEC = 'w_400,c_limit,f_auto,q_auto'
+
+
+def is_cloudinary_url(url):
+    return 'res.cloudinary.com' in url and '/upload/' in url
+
+
+@lru_cache(maxsize=2048)
+def transform_url(url, spec):
+    """Insert a Cloudinary transformation into an upload URL; other URLs pass through."""
+    if not is_cloudinary_url(url):
+        return url
+    return url.replace('/upload/', f'/upload/{spec}/', 1)
+
+
+@register.filter
+def cld(url, spec=DEFAULT_SPEC):
+    """Usage: {{ product.get_image_display_url|cld:"w_800,f_auto,q_auto" }}"""
+    if not url:
+        return ''
+    return transform_url(str(url), spec)
+
+
+@register.filter
+def cld_srcset(url, widths='400,800,1200'):
+    """Usage: srcset="{{ product.get_image_display_url|cld_srcset:'400,800' }}"
+
+    Returns an empty string for non-Cloudinary URLs so the plain src is used.
+    """
+    url = str(url or '')
+    if not is_cloudinary_url(url):
+        return ''
+    return ', '.join(
+        f"{transform_url(url, f'w_{width},c_limit,f_auto,q_auto')} {width}w"
+        for width in (w.strip() for w in widths.split(','))
+    )
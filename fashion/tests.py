@@ -1,3 +1,430 @@
-from django.test import TestCase
+from datetime import timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest import mock
+import io
 
-# Create your tests here.
+from django.conf import settings
+from django.db import connection
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from PIL import Image
+
+from .forms import DressForm
+from .models import PendingImage, Product, next_free_slug
+from .tasks import upload_product_image
+from .templatetags.cld import cld, cld_srcset
+
+
+def make_dress(name='Ankara Maxi', **kwargs):
+    fields = {
+        'category': 'dresses',
+        'dress_type': 'casual',
+        'description': 'A flowing maxi dress.',
+        'price': Decimal('120.00'),
+    }
+    fields.update(kwargs)
+    return Product.objects.create(name=name, **fields)
+
+
+DIRECT_IMAGE_URL = 'https://res.cloudinary.com/demo/image/upload/v1/domemily/products/dress_ab12.jpg'
+
+
+def cloudinary_enabled(test):
+    """Run test as if CLOUDINARY_URL pointed at the 'demo' cloud."""
+    test = mock.patch('fashion.uploads.CLOUDINARY_ENABLED', True)(test)
+    test = mock.patch('fashion.views.CLOUDINARY_ENABLED', True)(test)
+    return mock.patch(
+        'fashion.uploads.cloudinary.config', mock.Mock(return_value=SimpleNamespace(cloud_name='demo')),
+    )(test)
+
+
+# Production settings redirect plain-HTTP requests, and the manifest static
+# storage can't render templates before collectstatic has run
+view_settings = override_settings(
+    SECURE_SSL_REDIRECT=False,
+    STORAGES={
+        **settings.STORAGES,
+        'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+    },
+)
+
+
+@view_settings
+class BulkUploadTests(TestCase):
+    url = reverse('bulk_upload_dresses')
+
+    def post_csv(self, text):
+        csv_file = SimpleUploadedFile('dresses.csv', text.encode(), content_type='text/csv')
+        return self.client.post(self.url, {'csv_file': csv_file})
+
+    def test_creates_and_updates_dresses(self):
+        existing = make_dress('Kente Gown', price=Decimal('300.00'))
+        response = self.post_csv(
+            'name,dress_type,description,price,is_available,slug\n'
+            'Ankara Maxi,casual,Flowing.,120.50,yes,\n'
+            'Ankara Maxi,casual,Flowing.,99,no,\n'
+            f',,,250,no,{existing.slug}\n'
+        )
+        self.assertRedirects(response, reverse('manage_dresses'))
+
+        new = Product.objects.exclude(pk=existing.pk).order_by('slug')
+        self.assertEqual([p.slug for p in new], ['ankara-maxi', 'ankara-maxi-1'])
+        self.assertEqual(new[0].price, Decimal('120.50'))
+        self.assertFalse(new[1].is_available)
+        existing.refresh_from_db()
+        self.assertEqual(existing.price, Decimal('250.00'))
+        self.assertFalse(existing.is_available)
+
+    def test_invalid_rows_import_nothing(self):
+        existing = make_dress('Kente Gown', price=Decimal('300.00'))
+        response = self.post_csv(
+            'name,dress_type,description,price,slug\n'
+            'Good Dress,casual,Fine.,100,\n'
+            'Bad Price,casual,Fine.,Infinity,\n'
+            'Too Big,casual,Fine.,123456789,\n'
+            'Too Precise,casual,Fine.,1.999,\n'
+            f'{"x" * 200},casual,Fine.,10,\n'
+            f',,,5,{existing.slug}\n'
+        )
+        self.assertEqual(response.status_code, 200)
+        errors = response.context['errors']
+        self.assertEqual([error.split(':')[0] for error in errors], ['Row 3', 'Row 4', 'Row 5', 'Row 6'])
+        self.assertEqual(Product.objects.count(), 1)
+        existing.refresh_from_db()
+        self.assertEqual(existing.price, Decimal('300.00'))
+
+    def test_price_only_update_keeps_visibility(self):
+        hidden = make_dress('Kente Gown', price=Decimal('300.00'), is_available=False)
+        response = self.post_csv(f'slug,price\n{hidden.slug},275\n')
+        self.assertRedirects(response, reverse('manage_dresses'))
+        hidden.refresh_from_db()
+        self.assertEqual(hidden.price, Decimal('275.00'))
+        self.assertFalse(hidden.is_available)
+
+    def test_blank_price_update_keeps_price(self):
+        product = make_dress('Kente Gown', price=Decimal('300.00'))
+        self.post_csv(f'slug,price,is_available\n{product.slug},,no\n')
+        product.refresh_from_db()
+        self.assertEqual(product.price, Decimal('300.00'))
+        self.assertFalse(product.is_available)
+
+    def test_unknown_slug_is_reported(self):
+        response = self.post_csv('slug,price\nno-such-dress,10\n')
+        self.assertEqual(response.context['errors'], ['Row 2: No dress with slug "no-such-dress".'])
+
+
+@view_settings
+class ImageUploadTaskTests(TestCase):
+    def setUp(self):
+        self.product = make_dress(image_processing=True, is_available=False)
+        PendingImage.objects.create(product=self.product, name='dress.jpg', data=b'jpeg', make_available=True)
+
+    def test_failed_upload_keeps_pending_image(self):
+        with mock.patch('fashion.tasks.cloudinary_upload', return_value=None):
+            upload_product_image(self.product.pk)
+        self.product.refresh_from_db()
+        self.assertFalse(self.product.image_processing)
+        self.assertTrue(self.product.image_upload_failed)
+        self.assertTrue(PendingImage.objects.filter(product=self.product).exists())
+
+    def test_retry_applies_image_and_availability(self):
+        Product.objects.filter(pk=self.product.pk).update(image_processing=False, image_upload_failed=True)
+        result = {'secure_url': 'https://res.cloudinary.com/demo/image/upload/v1/domemily/products/dress.jpg',
+                  'public_id': 'domemily/products/dress'}
+        with mock.patch('fashion.tasks.cloudinary_upload', return_value=result), \
+                self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('retry_dress_image', args=[self.product.pk]))
+        self.assertRedirects(response, reverse('manage_dresses'))
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.image_public_id, 'domemily/products/dress')
+        self.assertTrue(self.product.is_available)
+        self.assertFalse(self.product.image_upload_failed)
+        self.assertFalse(PendingImage.objects.exists())
+
+    def test_stale_failed_images_are_discarded(self):
+        stale = make_dress('Kente Gown')
+        PendingImage.objects.create(product=stale, name='old.jpg', data=b'jpeg')
+        Product.objects.filter(pk=stale.pk).update(
+            image_upload_failed=True, updated_at=timezone.now() - timedelta(days=8),
+        )
+        with mock.patch('fashion.tasks.cloudinary_upload', return_value=None):
+            upload_product_image(self.product.pk)
+        # The fresh failure is kept for a retry; the week-old one is gone
+        self.assertEqual(list(PendingImage.objects.values_list('product_id', flat=True)), [self.product.pk])
+
+    def test_oversized_images_are_rejected(self):
+        buffer = io.BytesIO()
+        Image.new('RGB', (8, 8)).save(buffer, 'PNG')
+        image = SimpleUploadedFile('dress.png', buffer.getvalue(), content_type='image/png')
+        form = DressForm(
+            {'name': 'Maxi', 'dress_type': 'casual', 'description': 'Long.', 'price': '10'},
+            {'image': image},
+        )
+        with mock.patch('fashion.forms.MAX_IMAGE_SIZE', image.size - 1):
+            self.assertFalse(form.is_valid())
+        self.assertIn('Images must be', form.errors['image'][0])
+
+
+@view_settings
+class ProductCacheTests(TestCase):
+    def test_home_grid_changes_after_toggle(self):
+        product = make_dress('Kente Gown')
+        self.assertContains(self.client.get(reverse('home')), 'Kente Gown')
+
+        self.client.post(reverse('toggle_dress', args=[product.pk]))
+        self.assertNotContains(self.client.get(reverse('home')), 'Kente Gown')
+
+    def test_home_grid_sees_writes_from_other_processes(self):
+        product = make_dress('Kente Gown')
+        self.assertContains(self.client.get(reverse('home')), 'Kente Gown')
+
+        # A queryset update, as the upload worker does, with no local signal or cache write
+        Product.objects.filter(pk=product.pk).update(is_available=False, updated_at=timezone.now())
+        self.assertNotContains(self.client.get(reverse('home')), 'Kente Gown')
+
+    def test_etag_returns_304_until_products_change(self):
+        url = reverse('api-product-list')
+        product = make_dress()
+        etag = self.client.get(url)['ETag']
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        self.client.post(reverse('toggle_dress', args=[product.pk]))
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_etag_changes_when_a_product_is_deleted(self):
+        url = reverse('api-product-list')
+        make_dress('Kente Gown')
+        product = make_dress()
+        etag = self.client.get(url)['ETag']
+        product.delete()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+
+@view_settings
+class DirectUploadTests(TestCase):
+    dress = {'name': 'Kente Gown', 'dress_type': 'casual', 'description': 'Woven.', 'price': '300'}
+
+    def test_signature_unavailable_without_cloudinary(self):
+        response = self.client.get(reverse('api-cloudinary-sign'))
+        self.assertEqual(response.status_code, 503)
+
+    @cloudinary_enabled
+    def test_signature_returns_signed_params(self):
+        signed = {'timestamp': 1, 'folder': 'domemily/products', 'signature': 'abc',
+                  'api_key': 'key', 'upload_url': 'https://api.cloudinary.com/v1_1/demo/image/upload'}
+        with mock.patch('fashion.views.sign_upload_params', return_value=signed):
+            response = self.client.get(reverse('api-cloudinary-sign'))
+        self.assertEqual(response.json(), signed)
+
+    @cloudinary_enabled
+    def test_foreign_image_url_is_rejected(self):
+        form = DressForm({**self.dress, 'image_url': 'https://example.com/domemily/products/dress.jpg'})
+        self.assertFalse(form.is_valid())
+        self.assertEqual(form.errors['image_url'], ['Invalid image URL.'])
+
+    @cloudinary_enabled
+    def test_upload_derives_public_id_from_url(self):
+        response = self.client.post(reverse('upload_dress'), {
+            **self.dress, 'image_url': DIRECT_IMAGE_URL, 'image_public_id': 'domemily/other/asset',
+        })
+        self.assertRedirects(response, reverse('manage_dresses'))
+        product = Product.objects.get()
+        self.assertEqual(product.image_url, DIRECT_IMAGE_URL)
+        self.assertEqual(product.image_public_id, 'domemily/products/dress_ab12')
+        self.assertFalse(product.image_processing)
+        self.assertFalse(PendingImage.objects.exists())
+
+    @cloudinary_enabled
+    def test_invalid_form_resends_uploaded_image(self):
+        response = self.client.post(reverse('upload_dress'), {**self.dress, 'price': '', 'image_url': DIRECT_IMAGE_URL})
+        self.assertContains(response, f'name="image_url" value="{DIRECT_IMAGE_URL}"')
+        self.assertFalse(Product.objects.exists())
+
+    @cloudinary_enabled
+    def test_edit_replaces_image_and_clears_queued_upload(self):
+        product = make_dress(image_public_id='domemily/products/old', image_processing=True)
+        PendingImage.objects.create(product=product, name='dress.jpg', data=b'jpeg')
+        with mock.patch('fashion.tasks.delete_from_cloudinary') as delete, \
+                self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('edit_dress', args=[product.pk]), {**self.dress, 'image_url': DIRECT_IMAGE_URL})
+        delete.assert_called_once_with('domemily/products/old')
+        product.refresh_from_db()
+        self.assertEqual(product.image_public_id, 'domemily/products/dress_ab12')
+        self.assertFalse(product.image_processing)
+        self.assertFalse(PendingImage.objects.exists())
+
+
+class SlugTests(TestCase):
+    def test_next_free_slug_picks_lowest_free_suffix(self):
+        self.assertEqual(next_free_slug('maxi', set()), 'maxi')
+        self.assertEqual(next_free_slug('maxi', {'maxi', 'maxi-1', 'maxi-3'}), 'maxi-2')
+
+    def test_save_suffixes_colliding_slugs(self):
+        slugs = [make_dress('Ankara Maxi').slug for _ in range(3)]
+        self.assertEqual(slugs, ['ankara-maxi', 'ankara-maxi-1', 'ankara-maxi-2'])
+
+    def test_save_looks_up_collisions_in_one_query(self):
+        for _ in range(5):
+            make_dress('Ankara Maxi')
+        # One SELECT for taken slugs, then SAVEPOINT, INSERT and RELEASE
+        with self.assertNumQueries(4):
+            product = make_dress('Ankara Maxi')
+        self.assertEqual(product.slug, 'ankara-maxi-5')
+
+    def test_long_names_fit_the_slug_column(self):
+        for _ in range(2):
+            product = make_dress('x' * 150)
+            self.assertLessEqual(len(product.slug), Product._meta.get_field('slug').max_length)
+
+    def test_save_retries_with_random_suffix_on_integrity_error(self):
+        make_dress('Ankara Maxi')
+        # Simulate another request taking the slug between the lookup and the insert
+        with mock.patch('fashion.models.next_free_slug', return_value='ankara-maxi'):
+            product = make_dress('Ankara Maxi')
+        self.assertRegex(product.slug, r'^ankara-maxi-[0-9a-f]{6}$')
+
+
+@view_settings
+class DressFormTests(TestCase):
+    def test_missing_fields_use_dashboard_messages(self):
+        form = DressForm({}, require_image=True)
+        self.assertFalse(form.is_valid())
+        self.assertEqual(set(form.error_list()), {
+            'Dress name is required.',
+            'Please select a dress type.',
+            'Description is required.',
+            'Price is required.',
+            'Please upload an image.',
+        })
+
+    def test_invalid_and_negative_prices(self):
+        data = {'name': 'Maxi', 'dress_type': 'casual', 'description': 'Long.'}
+        form = DressForm({**data, 'price': 'abc'})
+        self.assertFalse(form.is_valid())
+        self.assertEqual(form.errors['price'], ['Invalid price format.'])
+
+        form = DressForm({**data, 'price': '-5'})
+        self.assertFalse(form.is_valid())
+        self.assertEqual(form.errors['price'], ['Price must be a positive number.'])
+
+    def test_upload_page_shows_errors_and_keeps_input(self):
+        response = self.client.post(reverse('upload_dress'), {'name': 'Kente Gown', 'price': '300'})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Description is required.', response.context['errors'])
+        self.assertEqual(response.context['form_data']['name'], 'Kente Gown')
+        self.assertFalse(Product.objects.exists())
+
+
+@view_settings
+class ManageDressesTests(TestCase):
+    def test_tab_counts_come_from_one_aggregate_query(self):
+        make_dress('Kente Gown')
+        make_dress('Ankara Maxi', is_available=False)
+        make_dress('Lace Top', category='tops')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('manage_dresses'), {'filter': 'hidden'})
+        self.assertEqual(
+            [response.context[key] for key in ('all_count', 'available_count', 'hidden_count')], [2, 1, 1],
+        )
+        self.assertEqual(sum('COUNT(' in query['sql'] for query in queries.captured_queries), 1)
+        self.assertEqual([p.name for p in response.context['products']], ['Ankara Maxi'])
+
+
+@view_settings
+class ProductListApiTests(TestCase):
+    url = reverse('api-product-list')
+
+    def test_pages_of_visible_products(self):
+        for i in range(settings.REST_FRAMEWORK['PAGE_SIZE'] + 1):
+            make_dress(f'Dress {i}')
+        make_dress('Hidden Gown', is_available=False)
+
+        first = self.client.get(self.url).json()
+        self.assertEqual(first['count'], 25)
+        self.assertEqual(len(first['results']), 24)
+        self.assertIsNotNone(first['next'])
+        second = self.client.get(first['next']).json()
+        names = {p['name'] for p in first['results'] + second['results']}
+        self.assertEqual(names, {f'Dress {i}' for i in range(25)})
+
+    def test_listing_fields_only(self):
+        product = make_dress(image_url=DIRECT_IMAGE_URL)
+        result = self.client.get(self.url).json()['results'][0]
+        self.assertEqual(result, {
+            'id': product.pk,
+            'name': 'Ankara Maxi',
+            'slug': 'ankara-maxi',
+            'category': 'dresses',
+            'dress_type': 'casual',
+            'price': '120.00',
+            'image_url': DIRECT_IMAGE_URL,
+        })
+
+
+class CloudinaryFilterTests(SimpleTestCase):
+    def test_cld_inserts_transformation(self):
+        self.assertEqual(
+            cld(DIRECT_IMAGE_URL),
+            'https://res.cloudinary.com/demo/image/upload/w_400,c_limit,f_auto,q_auto/v1/domemily/products/dress_ab12.jpg',
+        )
+        self.assertIn('/upload/w_800,f_auto/', cld(DIRECT_IMAGE_URL, 'w_800,f_auto'))
+
+    def test_cld_passes_other_urls_through(self):
+        self.assertEqual(cld('/media/products/dress.jpg'), '/media/products/dress.jpg')
+        self.assertEqual(cld(''), '')
+        self.assertEqual(cld(None), '')
+
+    def test_cld_srcset_lists_widths(self):
+        srcset = cld_srcset(DIRECT_IMAGE_URL, '400, 800')
+        self.assertEqual([entry.split()[1] for entry in srcset.split(', ')], ['400w', '800w'])
+        self.assertIn('/upload/w_800,c_limit,f_auto,q_auto/', srcset)
+        self.assertEqual(cld_srcset('/media/products/dress.jpg'), '')
+
+
+@view_settings
+class ToggleDressTests(TestCase):
+    def test_toggle_locks_row_and_saves_only_availability(self):
+        product = make_dress()
+        with mock.patch.object(Product.objects, 'select_for_update', wraps=Product.objects.select_for_update) as lock, \
+                CaptureQueriesContext(connection) as queries:
+            response = self.client.post(reverse('toggle_dress', args=[product.pk]))
+        update = next(query['sql'] for query in queries.captured_queries if query['sql'].startswith('UPDATE'))
+        self.assertRedirects(response, reverse('manage_dresses'))
+        lock.assert_called_once_with()
+        self.assertNotIn('"price"', update)
+        product.refresh_from_db()
+        self.assertFalse(product.is_available)
+
+    def test_get_does_not_toggle(self):
+        product = make_dress()
+        self.client.get(reverse('toggle_dress', args=[product.pk]))
+        product.refresh_from_db()
+        self.assertTrue(product.is_available)
+
+
+@view_settings
+class RecentDressesTests(TestCase):
+    def test_upload_page_defers_recent_dresses(self):
+        make_dress('Kente Gown')
+        response = self.client.get(reverse('upload_dress'))
+        self.assertContains(response, f'data-url="{reverse("recent_dresses")}"')
+        self.assertNotContains(response, 'Kente Gown')
+
+    def test_fragment_lists_latest_four_dresses(self):
+        for name in ('One', 'Two', 'Three', 'Four', 'Five'):
+            make_dress(f'Dress {name}', is_available=name == 'One')
+        make_dress('Lace Top', category='tops')
+        response = self.client.get(reverse('recent_dresses'))
+        self.assertTemplateUsed(response, 'fashion/recent_dresses.html')
+        self.assertTemplateNotUsed(response, 'fashion/base.html')
+        self.assertEqual(len(response.context['recent_products']), 4)
+        self.assertNotContains(response, 'Lace Top')
+        self.assertContains(response, 'Hidden')
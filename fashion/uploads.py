@@ -0,0 +1,87 @@
+from functools import partial
+import os
+import re
+import time
+
+# Cloudinary requires chunks of at least 5MB; smaller files go up in one request
+UPLOAD_CHUNK_SIZE = int(os.getenv('CLOUDINARY_CHUNK_SIZE', 6_000_000))
+
+# Cloudinary folder for all product images (server and direct browser uploads)
+UPLOAD_FOLDER = "domemily/products"
+
+# Largest image accepted through the server (Cloudinary's free-plan limit);
+# queued images are held in the database and worker memory up to this size
+MAX_IMAGE_SIZE = 10 * 1024 * 1024
+
+
+# Try to import cloudinary (may fail if not configured)
+try:
+    import cloudinary
+    import cloudinary.uploader
+    import cloudinary.utils
+    CLOUDINARY_URL = os.getenv('CLOUDINARY_URL')
+    if CLOUDINARY_URL:
+        cloudinary.config(cloudinary_url=CLOUDINARY_URL)
+        # Sends the file in UPLOAD_CHUNK_SIZE parts; the queued image itself is already in memory
+        upload_image = partial(
+            cloudinary.uploader.upload_large,
+            chunk_size=UPLOAD_CHUNK_SIZE,
+            folder=UPLOAD_FOLDER,
+            resource_type="image",
+            use_filename=True,
+            unique_filename=True,
+        )
+        CLOUDINARY_ENABLED = True
+    else:
+        CLOUDINARY_ENABLED = False
+except ImportError:
+    CLOUDINARY_ENABLED = False
+
+
+def cloudinary_upload(file):
+    """Upload file to Cloudinary and return the API response (or None)."""
+    if not CLOUDINARY_ENABLED:
+        return None
+    try:
+        return upload_image(file)
+    except Exception as e:
+        print(f"Cloudinary upload error: {e}")
+        return None
+
+
+def delete_from_cloudinary(public_id):
+    """Remove an image from Cloudinary by its public_id."""
+    if not CLOUDINARY_ENABLED or not public_id:
+        return
+    try:
+        cloudinary.uploader.destroy(public_id, resource_type="image")
+    except Exception as e:
+        print(f"Cloudinary delete error: {e}")
+
+
+def sign_upload_params():
+    """Return signed parameters for a direct browser-to-Cloudinary upload."""
+    config = cloudinary.config()
+    params = {'timestamp': int(time.time()), 'folder': UPLOAD_FOLDER}
+    return {
+        **params,
+        'signature': cloudinary.utils.api_sign_request(params, config.api_secret),
+        'api_key': config.api_key,
+        'upload_url': cloudinary.utils.cloudinary_api_url('upload', resource_type='image'),
+    }
+
+
+def public_id_from_url(url):
+    """Return the public_id of an image in this app's product folder, or None.
+
+    Only plain delivery URLs as returned by an upload are accepted, e.g.
+    ``https://res.cloudinary.com/<cloud>/image/upload/v123/domemily/products/abc.jpg``.
+    """
+    if not CLOUDINARY_ENABLED:
+        return None
+    prefix = f"https://res.cloudinary.com/{cloudinary.config().cloud_name}/image/upload/"
+    if not url.startswith(prefix):
+        return None
+    match = re.fullmatch(rf"(?:v\d+/)?({re.escape(UPLOAD_FOLDER)}/[^/?#]+)\.\w+", url[len(prefix):])
+    return match.group(1) if match else None
+
@@ -10,12 +10,17 @@ urlpatterns = [
     
     # Dress Upload & Management (Dashboard)
     path('dashboard/upload-dress/', views.upload_dress, name='upload_dress'),
+    path('dashboard/recent-dresses/', views.recent_dresses, name='recent_dresses'),
+    path('dashboard/bulk-upload-dresses/', views.bulk_upload_dresses, name='bulk_upload_dresses'),
     path('dashboard/manage-dresses/', views.manage_dresses, name='manage_dresses'),
     path('dashboard/edit-dress/<int:product_id>/', views.edit_dress, name='edit_dress'),
     path('dashboard/toggle-dress/<int:product_id>/', views.toggle_dress, name='toggle_dress'),
+    path('dashboard/retry-image/<int:product_id>/', views.retry_dress_image, name='retry_dress_image'),
     path('dashboard/delete-dress/<int:product_id>/', views.delete_dress, name='delete_dress'),
 
     # API
     path('api/products/', views.ProductListAPIView.as_view(), name='api-product-list'),
+    path('api/product/<int:pk>/status/', views.ProductStatusAPIView.as_view(), name='api-product-status'),
+    path('api/cloudinary/sign/', views.CloudinarySignatureAPIView.as_view(), name='api-cloudinary-sign'),
     path('api/contact/', views.ContactCreateAPIView.as_view(), name='api-contact-create'),
 ]
\ No newline at end of file
@@ -1,40 +1,67 @@
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib import messages
 from django.conf import settings
-from rest_framework import generics
-from .models import Product, ContactMessage
-from .serializers import ProductSerializer, ContactMessageSerializer
-import os
-
-# Try to import cloudinary (may fail if not configured)
-try:
-    import cloudinary
-    import cloudinary.uploader
-    CLOUDINARY_URL = os.getenv('CLOUDINARY_URL')
-    if CLOUDINARY_URL:
-        cloudinary.config(cloudinary_url=CLOUDINARY_URL)
-        CLOUDINARY_ENABLED = True
-    else:
-        CLOUDINARY_ENABLED = False
-except ImportError:
-    CLOUDINARY_ENABLED = False
-
-
-def upload_to_cloudinary(file):
-    """Upload file to Cloudinary and return the URL."""
-    if not CLOUDINARY_ENABLED:
-        return None
-    try:
-        result = cloudinary.uploader.upload(file, folder="domemily/products")
-        return result.get('secure_url')
-    except Exception as e:
-        print(f"Cloudinary upload error: {e}")
-        return None
+from django.core.cache import cache
+from django.core.exceptions import NON_FIELD_ERRORS, ValidationError
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django.utils.text import capfirst
+from django.views.decorators.http import condition
+from rest_framework import generics, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from collections import defaultdict
+from functools import reduce
+import csv
+import hashlib
+import io
+import operator
+from .cache import products_version
+from .forms import DressForm
+from .models import Product, PendingImage, ContactMessage, next_free_slug, slug_base
+from .serializers import ProductListSerializer, ProductStatusSerializer, ContactMessageSerializer
+from .tasks import delete_product_image, upload_product_image
+from .uploads import CLOUDINARY_ENABLED, sign_upload_params
+
+
+def queue_image_upload(product, image, make_available=None):
+    """Store image bytes and hand them to the background uploader once product is committed.
+
+    DressForm caps images at MAX_IMAGE_SIZE, which bounds the blob built here.
+    """
+    PendingImage.objects.update_or_create(
+        product=product,
+        defaults={'name': image.name, 'data': b''.join(image.chunks()), 'make_available': make_available},
+    )
+    transaction.on_commit(lambda: upload_product_image.delay(product.id))
+
+
+def queue_image_delete(public_id):
+    """Remove an image from Cloudinary in the background once the change is committed."""
+    if public_id:
+        transaction.on_commit(lambda: delete_product_image.delay(public_id))
+
+
+# Columns needed to render a product card (name, link, price, image, badge)
+PRODUCT_CARD_FIELDS = ('name', 'slug', 'category', 'dress_type', 'price', 'image', 'image_url')
+
+# Seconds to keep the home grid cached (any product write changes the key sooner)
+HOME_CACHE_TIMEOUT = 300
 
 
 def home(request):
     # Get latest 8 products for the collection grid
-    latest_products = Product.objects.filter(is_available=True).order_by('-created_at')[:8]
+    latest_products = cache.get_or_set(
+        f'home:latest8:{products_version()}',
+        lambda: list(
+            Product.objects.filter(is_available=True)
+            .only(*PRODUCT_CARD_FIELDS)
+            .order_by('-created_at')[:8]
+        ),
+        HOME_CACHE_TIMEOUT,
+    )
     return render(request, "fashion/home.html", {
         "products": latest_products
     })
@@ -53,7 +80,7 @@ def product_detail(request, slug):
     related_products = Product.objects.filter(
         category=product.category,
         is_available=True
-    ).exclude(id=product.id).order_by('-created_at')[:4]
+    ).exclude(id=product.id).only(*PRODUCT_CARD_FIELDS).order_by('-created_at')[:4]
     
     return render(request, "fashion/product_detail.html", {
         "product": product,
@@ -67,74 +94,196 @@ def upload_dress(request):
     """View for uploading new dresses."""
     context = {
         'dress_types': Product.DRESS_TYPE_CHOICES,
-        'recent_products': Product.objects.filter(category='dresses').order_by('-created_at')[:4],
         'form_data': {},
+        'direct_upload': CLOUDINARY_ENABLED,
     }
     
     if request.method == 'POST':
-        errors = []
-        
-        # Get form data
-        name = request.POST.get('name', '').strip()
-        price = request.POST.get('price', '').strip()
-        description = request.POST.get('description', '').strip()
-        dress_type = request.POST.get('dress_type', '').strip()
-        is_available = request.POST.get('is_available') == 'on'
-        image = request.FILES.get('image')
+        form = DressForm(request.POST, request.FILES, require_image=True)
         
         # Store form data for repopulation
         context['form_data'] = {
-            'name': name,
-            'price': price,
-            'description': description,
-            'dress_type': dress_type,
+            field: request.POST.get(field, '').strip()
+            for field in ('name', 'price', 'description', 'dress_type')
         }
         
-        # Validation
-        if not name:
-            errors.append('Dress name is required.')
-        if not price:
-            errors.append('Price is required.')
+        if not form.is_valid():
+            context['errors'] = form.error_list()
+            # Re-send a browser-uploaded image so it isn't orphaned on Cloudinary
+            context['image_url'] = form.cleaned_data.get('image_url', '')
+        elif form.cleaned_data['image_url']:
+            # The browser already uploaded the image straight to Cloudinary
+            product = form.save(commit=False)
+            product.category = 'dresses'
+            product.image_url = form.cleaned_data['image_url']
+            product.image_public_id = form.cleaned_data['image_public_id']
+            product.save()
+            
+            messages.success(request, f'"{product.name}" has been uploaded successfully!')
+            return redirect('manage_dresses')
         else:
-            try:
-                price = float(price)
-                if price < 0:
-                    errors.append('Price must be a positive number.')
-            except ValueError:
-                errors.append('Invalid price format.')
-        if not description:
-            errors.append('Description is required.')
-        if not dress_type:
-            errors.append('Please select a dress type.')
-        if not image:
-            errors.append('Please upload an image.')
+            # Keep the dress hidden until its image is live on Cloudinary
+            product = form.save(commit=False)
+            make_available = product.is_available
+            product.category = 'dresses'
+            product.image_url = ''
+            product.image_processing = True
+            product.is_available = False
+            with transaction.atomic():
+                product.save()
+                queue_image_upload(product, form.cleaned_data['image'], make_available=make_available)
+            
+            messages.success(request, f'"{product.name}" has been uploaded! Its image is processing.')
+            return redirect('manage_dresses')
+    
+    return render(request, "fashion/upload_dress.html", context)
+
+
+def recent_dresses(request):
+    """Recently added dresses fragment, fetched by the upload page after it renders."""
+    recent_products = cache.get_or_set(
+        f'dashboard:recent4:{products_version()}',
+        lambda: list(
+            Product.objects.filter(category='dresses')
+            .only(*PRODUCT_CARD_FIELDS, 'is_available')
+            .order_by('-created_at')[:4]
+        ),
+        HOME_CACHE_TIMEOUT,
+    )
+    return render(request, "fashion/recent_dresses.html", {
+        "recent_products": recent_products
+    })
+
+
+# Rows per INSERT/UPDATE statement for CSV imports
+BULK_BATCH_SIZE = 500
+TRUTHY = {'1', 'true', 'yes', 'y', 'on'}
+
+
+def row_errors(line, product):
+    """Run the model's field validation, returning messages tagged with the CSV row."""
+    try:
+        product.full_clean(exclude=['slug'], validate_unique=False)
+    except ValidationError as e:
+        errors = []
+        for field, field_errors in e.message_dict.items():
+            label = '' if field == NON_FIELD_ERRORS else f'{capfirst(Product._meta.get_field(field).verbose_name)}: '
+            errors.extend(f'Row {line}: {label}{message}' for message in field_errors)
+        return errors
+    if product.price < 0:
+        return [f'Row {line}: Price must be a positive number.']
+    return []
+
+
+def parse_dress_rows(rows):
+    """Validate CSV rows; return (new products, updated products, errors).
+
+    Rows with a ``slug`` matching an existing product update its price and/or
+    availability, whichever cells are filled in; updated products are grouped
+    by the tuple of fields they change. All other rows become new dresses with
+    precomputed slugs. Every row is checked against the model's own field rules.
+    """
+    rows = list(rows)
+    errors = []
+    
+    # One query each for existing products and colliding slugs
+    update_slugs = [row.get('slug', '').strip() for row in rows if (row.get('slug') or '').strip()]
+    existing = Product.objects.in_bulk(update_slugs, field_name='slug')
+    bases = {slug_base((row.get('name') or '').strip()) for row in rows if not (row.get('slug') or '').strip()}
+    taken = set()
+    if bases:
+        taken = set(
+            Product.objects.filter(reduce(operator.or_, (Q(slug__startswith=b) for b in bases)))
+            .values_list('slug', flat=True)
+        )
+    
+    new_products, updated_products = [], defaultdict(list)
+    for line, row in enumerate(rows, start=2):  # line 1 is the header
+        row = {key: (value or '').strip() for key, value in row.items() if key}
+        is_available = (row.get('is_available') or 'yes').lower() in TRUTHY
+        
+        if row.get('slug'):
+            product = existing.get(row['slug'])
+            if product is None:
+                errors.append(f'Row {line}: No dress with slug "{row["slug"]}".')
+                continue
+            # Blank or missing cells leave that field as it is
+            fields = tuple(field for field in ('price', 'is_available') if row.get(field))
+            if not fields:
+                errors.append(f'Row {line}: Nothing to update; fill in price or is_available.')
+                continue
+            if 'price' in fields:
+                # full_clean converts the raw price and rejects non-finite or over-precise values
+                product.price = row['price']
+            if 'is_available' in fields:
+                product.is_available = is_available
+            errors.extend(row_errors(line, product))
+            updated_products[fields].append(product)
+            continue
         
-        if errors:
-            context['errors'] = errors
+        name = row.get('name', '')
+        if not row.get('dress_type'):
+            errors.append(f'Row {line}: Please select a dress type.')
+        
+        slug = next_free_slug(slug_base(name), taken)
+        taken.add(slug)
+        product = Product(
+            name=name,
+            slug=slug,
+            category='dresses',
+            dress_type=row.get('dress_type', ''),
+            description=row.get('description', ''),
+            price=row.get('price', ''),
+            image_url=row.get('image_url', ''),
+            is_available=is_available,
+        )
+        errors.extend(row_errors(line, product))
+        new_products.append(product)
+    
+    return new_products, updated_products, errors
+
+
+def bulk_upload_dresses(request):
+    """Import or update many dresses from a CSV file in one transaction."""
+    context = {
+        'dress_types': Product.DRESS_TYPE_CHOICES,
+    }
+    
+    if request.method == 'POST':
+        csv_file = request.FILES.get('csv_file')
+        if not csv_file:
+            context['errors'] = ['Please upload a CSV file.']
         else:
-            # Upload image to Cloudinary
-            image_url = upload_to_cloudinary(image)
+            try:
+                reader = csv.DictReader(io.TextIOWrapper(csv_file, encoding='utf-8-sig'))
+                new_products, updated_products, errors = parse_dress_rows(reader)
+            except (UnicodeDecodeError, csv.Error):
+                new_products, updated_products, errors = [], {}, ['Could not read the CSV file.']
             
-            if not image_url:
-                errors.append('Failed to upload image. Please try again.')
+            updated_count = sum(len(products) for products in updated_products.values())
+            if errors:
                 context['errors'] = errors
+            elif not new_products and not updated_count:
+                context['errors'] = ['The CSV file has no rows.']
             else:
-                # Create the product with Cloudinary URL
-                product = Product(
-                    name=name,
-                    category='dresses',
-                    dress_type=dress_type,
-                    description=description,
-                    price=price,
-                    image_url=image_url,
-                    is_available=is_available,
-                )
-                product.save()
+                # bulk_update doesn't apply auto_now, so stamp the rows it touches
+                now = timezone.now()
+                with transaction.atomic():
+                    Product.objects.bulk_create(new_products, batch_size=BULK_BATCH_SIZE)
+                    for fields, products in updated_products.items():
+                        for product in products:
+                            product.updated_at = now
+                        Product.objects.bulk_update(
+                            products, [*fields, 'updated_at'], batch_size=BULK_BATCH_SIZE
+                        )
                 
-                messages.success(request, f'"{name}" has been uploaded successfully!')
+                messages.success(
+                    request,
+                    f'Imported {len(new_products)} new and updated {updated_count} existing dress(es).',
+                )
                 return redirect('manage_dresses')
     
-    return render(request, "fashion/upload_dress.html", context)
+    return render(request, "fashion/bulk_upload_dresses.html", context)
 
 
 def manage_dresses(request):
@@ -153,16 +302,18 @@ def manage_dresses(request):
     if search_query:
         products = products.filter(name__icontains=search_query)
     
-    # Counts for filter tabs
-    all_dresses = Product.objects.filter(category='dresses')
+    # Counts for filter tabs (single query)
+    counts = Product.objects.filter(category='dresses').aggregate(
+        all_count=Count('id'),
+        available_count=Count('id', filter=Q(is_available=True)),
+        hidden_count=Count('id', filter=Q(is_available=False)),
+    )
     
     context = {
         'products': products,
         'current_filter': current_filter,
         'search_query': search_query,
-        'all_count': all_dresses.count(),
-        'available_count': all_dresses.filter(is_available=True).count(),
-        'hidden_count': all_dresses.filter(is_available=False).count(),
+        **counts,
     }
     
     return render(request, "fashion/manage_dresses.html", context)
@@ -175,53 +326,42 @@ def edit_dress(request, product_id):
     context = {
         'product': product,
         'dress_types': Product.DRESS_TYPE_CHOICES,
+        'direct_upload': CLOUDINARY_ENABLED,
     }
     
     if request.method == 'POST':
-        errors = []
-        
-        # Get form data
-        name = request.POST.get('name', '').strip()
-        price = request.POST.get('price', '').strip()
-        description = request.POST.get('description', '').strip()
-        dress_type = request.POST.get('dress_type', '').strip()
-        is_available = request.POST.get('is_available') == 'on'
-        image = request.FILES.get('image')
-        
-        # Validation
-        if not name:
-            errors.append('Dress name is required.')
-        if not price:
-            errors.append('Price is required.')
-        else:
-            try:
-                price = float(price)
-                if price < 0:
-                    errors.append('Price must be a positive number.')
-            except ValueError:
-                errors.append('Invalid price format.')
-        if not description:
-            errors.append('Description is required.')
-        if not dress_type:
-            errors.append('Please select a dress type.')
+        form = DressForm(request.POST, request.FILES, instance=product)
         
-        if errors:
-            context['errors'] = errors
+        if not form.is_valid():
+            context['errors'] = form.error_list()
+            # Re-send a browser-uploaded image so it isn't orphaned on Cloudinary
+            context['image_url'] = form.cleaned_data.get('image_url', '')
         else:
-            # Update the product
-            product.name = name
-            product.dress_type = dress_type
-            product.description = description
-            product.price = price
-            product.is_available = is_available
+            old_public_id = product.image_public_id
+            product = form.save(commit=False)
+            image = form.cleaned_data['image']
+            image_url = form.cleaned_data['image_url']
             
-            # Upload new image if provided
-            if image:
-                image_url = upload_to_cloudinary(image)
-                if image_url:
-                    product.image_url = image_url
+            if image_url:
+                # Uploaded directly by the browser; swap it in now
+                product.image_url = image_url
+                product.image_public_id = form.cleaned_data['image_public_id']
+                # Supersedes any queued upload, whose task will find nothing to do
+                product.image_processing = False
+                product.image_upload_failed = False
+            elif image:
+                # Queue new image (current image stays until it is replaced)
+                product.image_processing = True
+                product.image_upload_failed = False
             
-            product.save()
+            with transaction.atomic():
+                product.save()
+                if image_url:
+                    # A failed upload is superseded by the new image
+                    PendingImage.objects.filter(product=product).delete()
+                    queue_image_delete(old_public_id)
+                elif image:
+                    queue_image_upload(product, image)
             context['success'] = True
             context['product'] = product
     
@@ -231,9 +371,11 @@ def edit_dress(request, product_id):
 def toggle_dress(request, product_id):
     """Toggle dress availability."""
     if request.method == 'POST':
-        product = get_object_or_404(Product, id=product_id)
-        product.is_available = not product.is_available
-        product.save()
+        # Lock the row so concurrent toggles can't both read the same state
+        with transaction.atomic():
+            product = get_object_or_404(Product.objects.select_for_update(), id=product_id)
+            product.is_available = not product.is_available
+            product.save(update_fields=['is_available', 'updated_at'])
         
         status = "visible" if product.is_available else "hidden"
         messages.success(request, f'"{product.name}" is now {status}.')
@@ -241,12 +383,35 @@ def toggle_dress(request, product_id):
     return redirect('manage_dresses')
 
 
+def retry_dress_image(request, product_id):
+    """Re-queue a failed image upload from its kept pending image."""
+    if request.method == 'POST':
+        with transaction.atomic():
+            product = get_object_or_404(
+                Product.objects.select_for_update(), id=product_id, image_upload_failed=True,
+            )
+            if PendingImage.objects.filter(product=product).exists():
+                product.image_processing = True
+                product.image_upload_failed = False
+                product.save(update_fields=['image_processing', 'image_upload_failed', 'updated_at'])
+                transaction.on_commit(lambda: upload_product_image.delay(product.id))
+        
+        if product.image_processing:
+            messages.success(request, f'Retrying the image upload for "{product.name}".')
+        else:
+            messages.error(request, f'The image for "{product.name}" is no longer available. Please upload it again.')
+    
+    return redirect('manage_dresses')
+
+
 def delete_dress(request, product_id):
     """Delete a dress."""
     if request.method == 'POST':
         product = get_object_or_404(Product, id=product_id)
         name = product.name
-        product.delete()
+        with transaction.atomic():
+            product.delete()
+            queue_image_delete(product.image_public_id)
         messages.success(request, f'"{name}" has been deleted.')
     
     return redirect('manage_dresses')
@@ -254,9 +419,36 @@ def delete_dress(request, product_id):
 
 # --- API VIEWS ---
 
+def products_etag(request, *args, **kwargs):
+    """ETag for product listings: changes with any product write and the page/query."""
+    query = hashlib.md5(request.GET.urlencode().encode()).hexdigest()[:8]
+    return f"{products_version()}-{query}"
+
+
+@method_decorator(condition(etag_func=products_etag), name='get')
 class ProductListAPIView(generics.ListAPIView):
-    queryset = Product.objects.filter(is_available=True)
-    serializer_class = ProductSerializer
+    queryset = (
+        Product.objects.filter(is_available=True)
+        .only('id', 'name', 'slug', 'category', 'dress_type', 'price', 'image', 'image_url')
+        .order_by('-created_at')
+    )
+    serializer_class = ProductListSerializer
+
+class ProductStatusAPIView(generics.RetrieveAPIView):
+    """Polled by the dashboard while a product image is processing."""
+    queryset = Product.objects.only('id', 'image_url', 'image_processing', 'image_upload_failed', 'is_available')
+    serializer_class = ProductStatusSerializer
+
+class CloudinarySignatureAPIView(APIView):
+    """Signs a direct browser-to-Cloudinary upload so image bytes skip Django."""
+
+    def get(self, request):
+        if not CLOUDINARY_ENABLED:
+            return Response(
+                {'detail': 'Cloudinary is not configured.'},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
+        return Response(sign_upload_params())
 
 class ContactCreateAPIView(generics.CreateAPIView):
     queryset = ContactMessage.objects.all()
@@ -0,0 +1,16 @@
+"""
+Celery app for fashion_site.
+
+Background tasks (e.g. Cloudinary uploads) are discovered from each app's
+``tasks.py``. Configuration is read from Django settings prefixed ``CELERY_``.
+"""
+
+import os
+
+from celery import Celery
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'fashion_site.settings')
+
+app = Celery('fashion_site')
+app.config_from_object('django.conf:settings', namespace='CELERY')
+app.autodiscover_tasks()
@@ -28,8 +28,8 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 SECRET_KEY = os.getenv('SECRET_KEY', 'django-insecure-dev-only-key-change-in-production')
 
 # SECURITY WARNING: don't run with debug turned on in production!
-# TEMPORARILY FORCED TRUE TO DEBUG - CHANGE BACK AFTER!
-DEBUG = True
+# Off unless DEBUG=True is set in the environment (e.g. in your local .env)
+DEBUG = os.getenv('DEBUG', 'False').lower() in ('true', '1', 'yes')
 
 ALLOWED_HOSTS = ['*']
 
@@ -156,9 +156,6 @@ STATICFILES_DIRS = [
 # Where collectstatic will put files for production
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 
-# WhiteNoise compression and caching
-STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
-
 # ======================
 # CLOUDINARY (Production Media Storage)
 # ======================
@@ -169,13 +166,69 @@ if CLOUDINARY_URL:
     CLOUDINARY_STORAGE = {
         'CLOUDINARY_URL': CLOUDINARY_URL,
     }
-    DEFAULT_FILE_STORAGE = 'cloudinary_storage.storage.MediaCloudinaryStorage'
+    DEFAULT_STORAGE_BACKEND = 'cloudinary_storage.storage.MediaCloudinaryStorage'
     MEDIA_URL = '/media/'
 else:
     # Local storage fallback
+    DEFAULT_STORAGE_BACKEND = 'django.core.files.storage.FileSystemStorage'
     MEDIA_URL = '/media/'
     MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# STORAGES replaces DEFAULT_FILE_STORAGE/STATICFILES_STORAGE (removed in Django 5.1)
+STORAGES = {
+    'default': {
+        'BACKEND': DEFAULT_STORAGE_BACKEND,
+    },
+    'staticfiles': {
+        # WhiteNoise: pre-compressed, content-hashed files served with far-future
+        # immutable Cache-Control headers
+        'BACKEND': 'whitenoise.storage.CompressedManifestStaticFilesStorage',
+    },
+}
+
+# ======================
+# REST FRAMEWORK
+# ======================
+REST_FRAMEWORK = {
+    # Cap list responses instead of returning every product at once
+    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'PAGE_SIZE': 24,
+}
+
+
+# Spool request uploads over 1MB to disk while the request is parsed. Queued
+# images are still copied into the database afterwards (capped by
+# fashion.uploads.MAX_IMAGE_SIZE); direct browser uploads skip Django entirely.
+FILE_UPLOAD_MAX_MEMORY_SIZE = 1024 * 1024
+
+
+# ======================
+# CACHE
+# ======================
+REDIS_URL = os.getenv('REDIS_URL')
+
+if REDIS_URL:
+    # Shared across gunicorn workers so each cached grid is built once, not per process
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+# Otherwise Django's default per-process local-memory cache is used; product
+# cache keys are derived from the database, so stale entries are never served
+
+
+# ======================
+# CELERY (Background Tasks)
+# ======================
+# Opt-in only: setting REDIS_URL for the cache must not move uploads to a worker
+CELERY_BROKER_URL = os.getenv('CELERY_BROKER_URL')
+
+# Without a broker, run tasks inline so local development needs no Redis/worker
+CELERY_TASK_ALWAYS_EAGER = not CELERY_BROKER_URL
+CELERY_TASK_IGNORE_RESULT = True
+
 
 # ======================
 # PRODUCTION SECURITY
@@ -10,9 +10,7 @@ urlpatterns = [
     path("", include("fashion.urls")),
 ]
 
-# This block is crucial for images to show in development
-if settings.DEBUG:
-    # Serve uploaded media (Product images)
+# Local development without Cloudinary: serve uploaded product images.
+# Static files are served by WhiteNoise (and runserver's staticfiles app).
+if settings.DEBUG and not settings.CLOUDINARY_URL:
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
-    # Serve static design files (About page images) <--- THIS WAS MISSING
-    urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
\ No newline at end of file